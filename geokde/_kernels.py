@@ -4,8 +4,8 @@ All kernels accept the following parameters:
 
 Parameters
 ----------
-distance : int | float
-    Euclidean distance value for a given point from the reference point.
+distance : numpy.ndarray | int | float
+    Euclidean distance value(s) for given point(s) from the reference point.
 radius : int | float
     Search window radius for the reference point.
 weight : int | float
@@ -15,10 +15,16 @@ And provide the following return:
 
 Returns
 -------
-value : float
-    Specified kernel's density estimation value.
+value : numpy.ndarray | float
+    Specified kernel's density estimation value(s).
+
+Kernels are NumPy ufuncs, compiled for the given argument types on first call and
+evaluated element-wise over array arguments in a single pass. Values beyond `radius`
+are clamped to zero rather than branched on, so evaluation compiles to SIMD
+instructions.
 """
 
+import numba
 import numpy as np
 
 
@@ -28,93 +34,129 @@ VALID_KERNELS = [
     "triweight",
 ]
 
+# normalisation constants of the scaled kernels, less the 1 / radius ** 2 term
+QUARTIC_SCALE = (116 / (5 * np.pi)) * (15 / 16)
+EPANECHNIKOV_SCALE = (8 / (3 * np.pi)) * (3 / 4)
+TRIWEIGHT_SCALE = (128 / (35 * np.pi)) * (35 / 32)
+
 
-@np.vectorize
+@numba.vectorize(cache=True, fastmath=True)
 def quartic_raw(
     distance: int | float,
     radius: int | float,
     weight: int | float,
 ) -> float:
     """Raw Quartic kernel."""
-    if distance < radius:
-        value = weight * pow(1 - pow(distance / radius, 2), 2)
-    else:
-        value = 0.0
-    return value
+    u = distance / radius
+    base = max(1 - u * u, 0.0)
+    return weight * base * base
 
 
-@np.vectorize
+@numba.vectorize(cache=True, fastmath=True)
 def quartic_scaled(
     distance: int | float,
     radius: int | float,
     weight: int | float,
 ) -> float:
     """Scaled Quartic kernel."""
-    if distance < radius:
-        norm_const = 116 / (5 * np.pi * pow(radius, 2))
-        value = weight * (
-            norm_const * (15 / 16) * pow(1 - pow(distance / radius, 2), 2)
-        )
-    else:
-        value = 0.0
-    return value
+    u = distance / radius
+    base = max(1 - u * u, 0.0)
+    return weight * QUARTIC_SCALE / (radius * radius) * base * base
 
 
-@np.vectorize
+@numba.vectorize(cache=True, fastmath=True)
 def epanechnikov_raw(
     distance: int | float,
     radius: int | float,
     weight: int | float,
 ) -> float:
     """Raw Epanechnikov kernel."""
-    if distance < radius:
-        value = weight * (1 - pow(distance / radius, 2))
-    else:
-        value = 0.0
-    return value
+    u = distance / radius
+    base = max(1 - u * u, 0.0)
+    return weight * base
 
 
-@np.vectorize
+@numba.vectorize(cache=True, fastmath=True)
 def epanechnikov_scaled(
     distance: int | float,
     radius: int | float,
     weight: int | float,
 ) -> float:
     """Scaled Epanechnikov kernel."""
-    if distance < radius:
-        norm_const = 8 / (3 * np.pi * pow(radius, 2))
-        value = weight * (norm_const * (3 / 4) * (1 - pow(distance / radius, 2)))
-    else:
-        value = 0.0
-    return value
+    u = distance / radius
+    base = max(1 - u * u, 0.0)
+    return weight * EPANECHNIKOV_SCALE / (radius * radius) * base
 
 
-@np.vectorize
+@numba.vectorize(cache=True, fastmath=True)
 def triweight_raw(
     distance: int | float,
     radius: int | float,
     weight: int | float,
 ) -> float:
     """Raw triweight kernel."""
-    if distance < radius:
-        value = weight * pow(1 - pow(distance / radius, 2), 3)
-    else:
-        value = 0.0
-    return value
+    u = distance / radius
+    base = max(1 - u * u, 0.0)
+    return weight * base * base * base
 
 
-@np.vectorize
+@numba.vectorize(cache=True, fastmath=True)
 def triweight_scaled(
     distance: int | float,
     radius: int | float,
     weight: int | float,
 ) -> float:
     """Scaled triweight kernel."""
-    if distance < radius:
-        norm_const = 128 / (35 * np.pi * pow(radius, 2))
-        value = weight * (
-            norm_const * (35 / 32) * pow(1 - pow(distance / radius, 2), 3)
-        )
-    else:
-        value = 0.0
-    return value
+    u = distance / radius
+    base = max(1 - u * u, 0.0)
+    return weight * TRIWEIGHT_SCALE / (radius * radius) * base * base * base
+
+
+# exponent of each kernel's polynomial in (distance / radius) ** 2 and normalisation
+# constant of its scaled form
+KERNEL_PARAMS = {
+    "epanechnikov": (1, EPANECHNIKOV_SCALE),
+    "quartic": (2, QUARTIC_SCALE),
+    "triweight": (3, TRIWEIGHT_SCALE),
+}
+
+
+def evaluate_all(
+    distance: np.ndarray | int | float,
+    radius: np.ndarray | int | float,
+    weight: np.ndarray | int | float,
+) -> dict[str, np.ndarray]:
+    """Evaluate every raw and scaled kernel, sharing the squared-distance term.
+
+    Parameters
+    ----------
+    distance : numpy.ndarray | int | float
+        Euclidean distance value(s) for given point(s) from the reference point.
+    radius : numpy.ndarray | int | float
+        Search window radius for the reference point.
+    weight : numpy.ndarray | int | float
+        Value with which the KDE value for a point will be weighted.
+
+    Returns
+    -------
+    values : dict[str, numpy.ndarray]
+        Kernels' density estimation values, keyed by kernel function name, e.g.
+        "quartic_raw" or "quartic_scaled".
+    """
+    distance, radius, weight = (
+        np.asarray(arg, dtype=np.float64) for arg in (distance, radius, weight)
+    )
+    u = distance / radius
+    # the clamped base 1 - u ** 2 raised to each kernel's exponent: 1, 2, and 3
+    u2 = np.maximum(1 - u * u, 0.0)
+    u4 = u2 * u2
+    u6 = u4 * u2
+    inv_radius_sq = 1 / (radius * radius)
+    return {
+        "epanechnikov_raw": weight * u2,
+        "epanechnikov_scaled": weight * EPANECHNIKOV_SCALE * inv_radius_sq * u2,
+        "quartic_raw": weight * u4,
+        "quartic_scaled": weight * QUARTIC_SCALE * inv_radius_sq * u4,
+        "triweight_raw": weight * u6,
+        "triweight_scaled": weight * TRIWEIGHT_SCALE * inv_radius_sq * u6,
+    }
@@ -1,15 +1,35 @@
+import contextlib
+import functools
+import threading
+
 import geopandas as gpd
+import numba
 import numpy as np
-import pandas as pd
+import numpy.typing as npt
+import shapely
+
+from geokde._kernels import KERNEL_PARAMS
+
+
+VALID_METHODS = [
+    "direct",
+    "fft",
+]
+
+# byte alignment of the KDE array, that of a cache line and an AVX-512 register
+ALIGNMENT = 64
+
+# side length in cells of the square tiles in which KDE is accumulated, such that a
+# float32 tile fits in L2 cache
+TILE_SIZE = 256
+
+# whether numpy.fft transforms float32 in single precision (NumPy >= 2), rather than
+# upcasting to float64
+FFT_SINGLE_PRECISION = np.fft.rfft(np.zeros(1, dtype=np.float32)).dtype == np.complex64
 
-from geokde._kernels import (
-    epanechnikov_raw,
-    epanechnikov_scaled,
-    quartic_raw,
-    quartic_scaled,
-    triweight_raw,
-    triweight_scaled,
-)
+# serialises calls to parallel compiled functions where numba cannot run them
+# concurrently, see `parallel_guard`
+_PARALLEL_LOCK = threading.Lock()
 
 
 def validate_transform(
@@ -20,9 +40,9 @@ def validate_transform(
     """Validation and transformation function for weight and radius arguments.
 
     If `arg` is present in the GeoDataFrame's columns, said column will be used
-    preferentially and converted to ndarray, assuming it is complete and of numeric
-    dtype.
-    If `arg` is not present in the GeoDataFrame's columns but is int or float, an
+    preferentially and converted to a float64 ndarray, without copying if already of
+    that dtype, assuming it is complete and of numeric dtype.
+    If `arg` is not present in the GeoDataFrame's columns but is int or float, a float64
     ndarray of equal length to the GeoDataFrame will be populated with the given value.
 
     Parameters
@@ -37,7 +57,7 @@ def validate_transform(
     Returns
     -------
     arg : numpy.ndarray
-        ndarray-transformation of `arg`.
+        float64 ndarray-transformation of `arg`.
 
     Raises
     ------
@@ -48,13 +68,15 @@ def validate_transform(
         If the column in which weight values are present is not of a numeric dtype.
     """
     if arg in points.columns:
-        if not pd.api.types.is_numeric_dtype(points[arg]):
+        column = points[arg]
+        if column.dtype.kind not in "biuf":
             raise TypeError(f"{arg_name} column must be numeric dtype.")
-        if points[arg].isnull().any():
+        # missing values, including nullable dtypes' NA, become NaN in a single pass
+        arg = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.isnan(arg).any():
             raise ValueError(f"{arg_name} column must be complete.")
-        arg = points[arg].to_numpy()
     elif isinstance(arg, (int, float)):
-        arg = np.full(len(points), arg)
+        arg = np.full(len(points), arg, dtype=np.float64)
     else:
         raise ValueError(
             f"{arg_name} must correspond to a GeoDataFrame column or be int or float.",
@@ -66,7 +88,8 @@ def create_array(
     bounds: np.ndarray,
     radius: int | float,
     resolution: int | float,
-) -> tuple[np.ndarray, list[int | float]]:
+    dtype: npt.DTypeLike = np.float32,
+) -> tuple[np.ndarray, list[float]]:
     """Generate an ndarray of shape derived from bounding coordinates and spatial
     resolution and calculate the radius- and shape-adjusted bounds thereof.
 
@@ -78,22 +101,32 @@ def create_array(
         Radius with which to adjust coordinates.
     resolution : int | float
         Spatial resolution for the output array.
+    dtype : numpy.typing.DTypeLike, default = numpy.float32
+        Data type of the output array.
 
     Returns
     -------
     array : numpy.ndarray
-        Array of shape determined using bounding coordinates and resolution.
-    list[int | float]
+        Array of zeros of shape determined using bounding coordinates and resolution,
+        aligned to `ALIGNMENT` bytes.
+    list[float]
         List of minx, miny, maxx, and maxy bounding coordinates for the array.
     """
-    minx, miny, maxx, maxy = bounds
+    # plain floats, for cheaper arithmetic than NumPy scalars and cleaner bounds
+    minx, miny, maxx, maxy = map(float, bounds)
+    radius = float(radius)
     minx -= radius
     maxy += radius
     width = round((maxx + radius - minx) / resolution)
     height = round((maxy - (miny - radius)) / resolution)
     maxx = minx + width * resolution
     miny = maxy - height * resolution
-    array = np.full((height, width), 0.0)
+    # zeroed lazily by the OS, so memory is only committed for regions written to
+    dtype = np.dtype(dtype)
+    nbytes = height * width * dtype.itemsize
+    buffer = np.zeros(nbytes + ALIGNMENT, dtype=np.uint8)
+    start = -buffer.ctypes.data % ALIGNMENT
+    array = buffer[start : start + nbytes].view(dtype).reshape(height, width)
     return array, [minx, miny, maxx, maxy]
 
 
@@ -104,8 +137,8 @@ def get_points(
     radius: np.ndarray,
     weight: np.ndarray,
     resolution: int | float,
-) -> np.ndarray:
-    """Generate an ndarray of point X and Y array coordinates, search window radii, and
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Generate ndarrays of point X and Y array coordinates, search window radii, and
     weights.
 
     Parameters
@@ -126,29 +159,67 @@ def get_points(
 
     Returns
     -------
-    array_points : numpy.ndarray
-        Points comprising array X and Y coordinates, search window radius, and weight.
+    x_idx : numpy.ndarray
+        Array X coordinates of the points.
+    y_idx : numpy.ndarray
+        Array Y coordinates of the points.
+    window : numpy.ndarray
+        Search window radii of the points in array cells.
+    weight : numpy.ndarray
+        Values with which the points' KDE values will be weighted.
     """
-    x_idx = (points.geometry.x - minx) / resolution
-    y_idx = (maxy - points.geometry.y) / resolution
+    coords = shapely.get_coordinates(points.geometry.values)
+    x_idx = (coords[:, 0] - minx) / resolution
+    y_idx = (maxy - coords[:, 1]) / resolution
     window = radius / resolution
-    array_points = np.column_stack((x_idx, y_idx, window, weight))
-    return array_points
+    return x_idx, y_idx, window, weight
+
+
+def parallel_guard() -> contextlib.AbstractContextManager:
+    """Guard a call to a parallel compiled function against concurrent calls from
+    other threads where numba's threading layer does not support them.
+
+    Numba's fallback "workqueue" threading layer, used where neither TBB nor OpenMP
+    is available, terminates the process if parallel functions are called
+    concurrently. Under it, or before any threading layer has been loaded, calls are
+    serialised with a lock; under "tbb" or "omp" they run unguarded.
+
+    Returns
+    -------
+    contextlib.AbstractContextManager
+        Context manager within which to make the call.
+    """
+    try:
+        layer = numba.threading_layer()
+    except ValueError:
+        # no threading layer is loaded until the first parallel call
+        return _PARALLEL_LOCK
+    if layer == "workqueue":
+        return _PARALLEL_LOCK
+    return contextlib.nullcontext()
 
 
 def calculate_kde(
-    points: np.ndarray,
+    x_idx: np.ndarray,
+    y_idx: np.ndarray,
+    window: np.ndarray,
+    weight: np.ndarray,
     array: np.ndarray,
     kernel: str,
     scale: bool,
 ) -> None:
-    """Iterate over elements of an ndarray comprising point properties.
+    """Select the compiled kernel parameters and perform KDE for all points.
 
     Parameters
     ----------
-    points : numpy.ndarray
-        Points comprising array X and Y coordinates, search window radius, and weight
-        for which KDE will be calculated.
+    x_idx : numpy.ndarray
+        Array X coordinates of the points for which KDE will be calculated.
+    y_idx : numpy.ndarray
+        Array Y coordinates of the points for which KDE will be calculated.
+    window : numpy.ndarray
+        Search window radii of the points in array cells.
+    weight : numpy.ndarray
+        Values with which the points' KDE values will be weighted.
     array : numpy.ndarray
         Array to which KDE values will be added.
     kernel : str
@@ -156,39 +227,400 @@ def calculate_kde(
     scale : bool
         Whether to calculate raw or scaled KDE values.
     """
-    kernel_vfuncs = {
-        "epanechnikov": epanechnikov_scaled if scale else epanechnikov_raw,
-        "quartic": quartic_scaled if scale else quartic_raw,
-        "triweight": triweight_scaled if scale else triweight_raw,
-    }
-    # challenge to vectorise as needs to operate on >1 array element
-    for point in points:
-        add_point_kde(point, array, kernel_vfuncs[kernel])
+    exponent, norm_const = KERNEL_PARAMS[kernel]
+    # match the array's precision so the compiled loop never upcasts
+    dtype = array.dtype
+    x_idx, y_idx, window, weight = (
+        arg.astype(dtype, copy=False) for arg in (x_idx, y_idx, window, weight)
+    )
+    if scale:
+        # fold the kernel's normalisation into each point's weight up front
+        weight = weight * (dtype.type(norm_const) / (window * window))
+    # search window of each point in array cells, clipped to the array
+    height, width = array.shape
+    window_cells = np.empty((len(x_idx), 4), dtype=np.int64)
+    window_cells[:, 0] = np.clip(np.rint(x_idx - window), 0, width)
+    window_cells[:, 1] = np.clip(np.rint(y_idx - window), 0, height)
+    window_cells[:, 2] = np.clip(np.rint(x_idx + window), 0, width)
+    window_cells[:, 3] = np.clip(np.rint(y_idx + window), 0, height)
+    args = (x_idx, y_idx, window, weight, window_cells, array, exponent)
+    # a single tile leaves nothing to parallelise or bucket
+    if height <= TILE_SIZE and width <= TILE_SIZE:
+        _calculate_kde_serial(*args)
+    else:
+        with parallel_guard():
+            _calculate_kde(*args)
 
 
+@numba.njit(cache=True, fastmath=True, nogil=True, parallel=True)
+def _calculate_kde(
+    x_idx: np.ndarray,
+    y_idx: np.ndarray,
+    window: np.ndarray,
+    weight: np.ndarray,
+    window_cells: np.ndarray,
+    array: np.ndarray,
+    exponent: int,
+) -> None:
+    """Iterate over point properties tile by tile, in parallel.
+
+    The array is divided into tiles of `TILE_SIZE` cells square and points are
+    grouped by the tiles their search windows intersect. Tiles are independent, so
+    each is processed by a single thread, adding only the part of each of its points'
+    KDE that falls within it while the tile is held in cache.
+
+    Parameters
+    ----------
+    x_idx : numpy.ndarray
+        Array X coordinates of the points for which KDE will be calculated.
+    y_idx : numpy.ndarray
+        Array Y coordinates of the points for which KDE will be calculated.
+    window : numpy.ndarray
+        Search window radii of the points in array cells.
+    weight : numpy.ndarray
+        Values with which the points' KDE values will be weighted.
+    window_cells : numpy.ndarray
+        Minimum X, minimum Y, maximum X, and maximum Y array coordinates of the points'
+        search windows, clipped to the array.
+    array : numpy.ndarray
+        Array to which KDE values will be added.
+    exponent : int
+        Exponent of the kernel polynomial.
+    """
+    n_points = x_idx.shape[0]
+    height, width = array.shape
+    n_tiles_y = (height + TILE_SIZE - 1) // TILE_SIZE
+    n_tiles_x = (width + TILE_SIZE - 1) // TILE_SIZE
+
+    # range of tiles intersected by each point's search window, empty if none
+    point_tiles = np.empty((n_points, 4), dtype=np.int64)
+    tile_counts = np.zeros(n_tiles_y * n_tiles_x + 1, dtype=np.int64)
+    for i in range(n_points):
+        minx, miny, maxx, maxy = window_cells[i]
+        if minx >= maxx or miny >= maxy:
+            point_tiles[i] = (0, 0, 0, 0)
+            continue
+        point_tiles[i] = (
+            minx // TILE_SIZE,
+            miny // TILE_SIZE,
+            (maxx - 1) // TILE_SIZE + 1,
+            (maxy - 1) // TILE_SIZE + 1,
+        )
+        for ty in range(point_tiles[i, 1], point_tiles[i, 3]):
+            for tx in range(point_tiles[i, 0], point_tiles[i, 2]):
+                tile_counts[ty * n_tiles_x + tx + 1] += 1
+
+    # indices of each tile's points, ordered by tile
+    tile_offsets = np.cumsum(tile_counts)
+    tile_fill = tile_offsets[:-1].copy()
+    tile_points = np.empty(tile_offsets[-1], dtype=np.int64)
+    for i in range(n_points):
+        for ty in range(point_tiles[i, 1], point_tiles[i, 3]):
+            for tx in range(point_tiles[i, 0], point_tiles[i, 2]):
+                tile = ty * n_tiles_x + tx
+                tile_points[tile_fill[tile]] = i
+                tile_fill[tile] += 1
+
+    for tile in numba.prange(n_tiles_y * n_tiles_x):
+        tile_miny = (tile // n_tiles_x) * TILE_SIZE
+        tile_minx = (tile % n_tiles_x) * TILE_SIZE
+        tile_maxx = min(tile_minx + TILE_SIZE, width)
+        tile_maxy = min(tile_miny + TILE_SIZE, height)
+        for j in range(tile_offsets[tile], tile_offsets[tile + 1]):
+            i = tile_points[j]
+            cells = (
+                max(window_cells[i, 0], tile_minx),
+                max(window_cells[i, 1], tile_miny),
+                min(window_cells[i, 2], tile_maxx),
+                min(window_cells[i, 3], tile_maxy),
+            )
+            add_point_kde(
+                x_idx[i],
+                y_idx[i],
+                window[i],
+                weight[i],
+                array,
+                exponent,
+                cells,
+            )
+
+
+@numba.njit(cache=True, fastmath=True, nogil=True)
+def _calculate_kde_serial(
+    x_idx: np.ndarray,
+    y_idx: np.ndarray,
+    window: np.ndarray,
+    weight: np.ndarray,
+    window_cells: np.ndarray,
+    array: np.ndarray,
+    exponent: int,
+) -> None:
+    """Iterate over point properties serially, for arrays no larger than a tile.
+
+    Parameters
+    ----------
+    x_idx : numpy.ndarray
+        Array X coordinates of the points for which KDE will be calculated.
+    y_idx : numpy.ndarray
+        Array Y coordinates of the points for which KDE will be calculated.
+    window : numpy.ndarray
+        Search window radii of the points in array cells.
+    weight : numpy.ndarray
+        Values with which the points' KDE values will be weighted.
+    window_cells : numpy.ndarray
+        Minimum X, minimum Y, maximum X, and maximum Y array coordinates of the points'
+        search windows, clipped to the array.
+    array : numpy.ndarray
+        Array to which KDE values will be added.
+    exponent : int
+        Exponent of the kernel polynomial.
+    """
+    for i in range(x_idx.shape[0]):
+        cells = (
+            int(window_cells[i, 0]),
+            int(window_cells[i, 1]),
+            int(window_cells[i, 2]),
+            int(window_cells[i, 3]),
+        )
+        add_point_kde(
+            x_idx[i],
+            y_idx[i],
+            window[i],
+            weight[i],
+            array,
+            exponent,
+            cells,
+        )
+
+
+@numba.njit(cache=True, fastmath=True, nogil=True)
 def add_point_kde(
-    point: np.ndarray,
+    x: float,
+    y: float,
+    window: float,
+    weight: float,
     array: np.ndarray,
-    kernel_vfunc: np.vectorize,
+    exponent: int,
+    cells: tuple[int, int, int, int],
 ) -> None:
-    """Perform KDE for a given point, adding the result to an array.
+    """Perform KDE for a given point, adding the result to a region of an array.
+
+    Distances are never materialised: each kernel is a polynomial in the squared
+    distance ratio, which is calculated and accumulated into `array` in one pass.
+    The region is clipped, row by row, to the chord of the circle of radius `window`
+    so cells in the search window's corners are skipped.
 
     Parameters
     ----------
-    point : numpy.ndarray
-        Properties of the point for which KDE will be calculated, including array X and
-        Y coordinates, search window radius, and weight.
+    x : float
+        Array X coordinate of the point.
+    y : float
+        Array Y coordinate of the point.
+    window : float
+        Search window radius of the point in array cells.
+    weight : float
+        Value with which the KDE values of the point will be weighted.
     array : numpy.ndarray
         Array to which KDE values will be added.
-    kernel_vfunc : numpy.vectorize
-        Vectorised kernel function with which to perform KDE.
+    exponent : int
+        Exponent of the kernel polynomial.
+    cells : tuple[int, int, int, int]
+        Minimum X, minimum Y, maximum X, and maximum Y array coordinates of the region
+        of the point's search window to which KDE values will be added, within the
+        shape of `array`.
+    """
+    minx, miny, maxx, maxy = cells
+    if minx >= maxx or miny >= maxy:
+        return
+    # constants typed as the array's dtype keep all arithmetic at its precision
+    zero = array.dtype.type(0.0)
+    half = array.dtype.type(0.5)
+    one = array.dtype.type(1.0)
+    window_sq = window * window
+    inv_window_sq = one / window_sq
+    for iy in range(miny, maxy):
+        dy = array.dtype.type(iy) + half - y
+        dy_sq = dy * dy
+        chord_sq = window_sq - dy_sq
+        if chord_sq <= 0.0:
+            continue
+        # only cells whose centres may lie within the chord of the circle at this row
+        half_chord = np.sqrt(chord_sq)
+        row_minx = max(minx, int(np.floor(x - half - half_chord)))
+        row_maxx = min(maxx, int(np.ceil(x - half + half_chord)) + 1)
+        # a zero-based, branch-free loop over a row slice compiles to SIMD
+        # instructions for the host CPU
+        row = array[iy, row_minx:row_maxx]
+        dx_min = array.dtype.type(row_minx) + half - x
+        for i in range(row.shape[0]):
+            dx = dx_min + array.dtype.type(i)
+            base = max(one - (dx * dx + dy_sq) * inv_window_sq, zero)
+            value = base
+            if exponent > 1:
+                value *= base
+            if exponent > 2:
+                value *= base
+            row[i] += weight * value
+
+
+def calculate_kde_fft(
+    x_idx: np.ndarray,
+    y_idx: np.ndarray,
+    window: np.ndarray,
+    weight: np.ndarray,
+    array: np.ndarray,
+    kernel: str,
+    scale: bool,
+) -> None:
+    """Perform KDE for points sharing a single search window radius by convolution.
+
+    Point weights are summed into the cells containing the points, which are then
+    convolved with the kernel's footprint via FFT. Points are thereby treated as
+    lying at their cells' centres.
+
+    Parameters
+    ----------
+    x_idx : numpy.ndarray
+        Array X coordinates of the points for which KDE will be calculated.
+    y_idx : numpy.ndarray
+        Array Y coordinates of the points for which KDE will be calculated.
+    window : numpy.ndarray
+        Search window radii of the points in array cells, all of which must be equal.
+    weight : numpy.ndarray
+        Values with which the points' KDE values will be weighted.
+    array : numpy.ndarray
+        Array to which KDE values will be added.
+    kernel : str
+        Kernel with which to perform KDE.
+    scale : bool
+        Whether to calculate raw or scaled KDE values.
+    """
+    height, width = array.shape
+    cols = np.floor(x_idx).astype(np.intp)
+    rows = np.floor(y_idx).astype(np.intp)
+    in_array = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+    # summed weights of the points in each cell, by flat cell index
+    impulses = np.bincount(
+        rows[in_array] * width + cols[in_array],
+        weights=weight[in_array],
+        minlength=height * width,
+    ).reshape(height, width)
+
+    footprint = _footprint(kernel, scale, float(window[0]))
+    offset = footprint.shape[0] // 2
+    shape = (_fft_length(height + 2 * offset), _fft_length(width + 2 * offset))
+    if FFT_SINGLE_PRECISION:
+        # transform in the array's precision, halving memory and work for float32;
+        # casting would otherwise only lose precision before an upcast to float64
+        impulses, footprint = (
+            arg.astype(array.dtype, copy=False) for arg in (impulses, footprint)
+        )
+    spectrum = np.fft.rfft2(impulses, shape) * np.fft.rfft2(footprint, shape)
+    convolved = np.fft.irfft2(spectrum, shape)
+    # a density from non-negative weights cannot be negative, only its round-off
+    nonnegative = not (weight < 0).any()
+    with parallel_guard():
+        _add_convolved(
+            array,
+            convolved,
+            offset,
+            np.finfo(array.dtype).eps,
+            nonnegative,
+        )
+
+
+@numba.njit(cache=True, fastmath=True, nogil=True, parallel=True)
+def _add_convolved(
+    array: np.ndarray,
+    convolved: np.ndarray,
+    offset: int,
+    eps: float,
+    nonnegative: bool,
+) -> None:
+    """Add the region of a full convolution corresponding to an array to said array,
+    zeroing round-off below the array's precision, e.g. beyond all points' windows,
+    and, for non-negative weights, negative round-off.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        Array to which KDE values will be added.
+    convolved : numpy.ndarray
+        Convolution of the array's point weights with a kernel footprint, padded by
+        `offset` cells at the start of each axis.
+    offset : int
+        Radius in cells of the kernel footprint.
+    eps : float
+        Machine epsilon of the array's dtype.
+    nonnegative : bool
+        Whether all point weights are non-negative, such that negative values can
+        only be round-off and are clamped to zero.
+    """
+    height, width = array.shape
+    row_peaks = np.zeros(height)
+    for iy in numba.prange(height):
+        row = convolved[iy + offset, offset : offset + width]
+        for ix in range(width):
+            row_peaks[iy] = max(row_peaks[iy], abs(row[ix]))
+    tolerance = eps * row_peaks.max()
+    for iy in numba.prange(height):
+        row = convolved[iy + offset, offset : offset + width]
+        cells = array[iy]
+        for ix in range(width):
+            value = row[ix] if abs(row[ix]) > tolerance else 0.0
+            cells[ix] += max(value, 0.0) if nonnegative else value
+
+
+@functools.lru_cache(maxsize=128)
+def _footprint(kernel: str, scale: bool, radius: float) -> np.ndarray:
+    """Evaluate a kernel with unit weight over the cells within a search window
+    radius of a cell centre, memoised as repeated KDE typically reuses radii.
+
+    Parameters
+    ----------
+    kernel : str
+        Kernel with which to perform KDE.
+    scale : bool
+        Whether to calculate raw or scaled KDE values.
+    radius : float
+        Search window radius in array cells.
+
+    Returns
+    -------
+    footprint : numpy.ndarray
+        Read-only square array of kernel values, centred on the cell at its centre.
+    """
+    exponent, norm_const = KERNEL_PARAMS[kernel]
+    offset = int(np.ceil(radius))
+    y_off, x_off = np.ogrid[-offset : offset + 1, -offset : offset + 1]
+    # kernels are polynomials in squared distance, so no square root is needed
+    base = np.maximum(1 - (x_off * x_off + y_off * y_off) / (radius * radius), 0.0)
+    footprint = base**exponent
+    if scale:
+        footprint *= norm_const / (radius * radius)
+    footprint.flags.writeable = False
+    return footprint
+
+
+def _fft_length(length: int) -> int:
+    """Find the smallest length of at least `length` with only 2, 3, and 5 as prime
+    factors, for which FFTs are fastest.
+
+    Parameters
+    ----------
+    length : int
+        Minimum length.
+
+    Returns
+    -------
+    int
+        Fast FFT length.
     """
-    x, y, window, weight = point
-    minx = round(x - window)
-    miny = round(y - window)
-    maxx = round(x + window)
-    maxy = round(y + window)
-    y_idx, x_idx = np.ogrid[miny + 0.5 : maxy + 0.5, minx + 0.5 : maxx + 0.5]
-    dist_array = np.sqrt(pow(x_idx - x, 2) + pow(y_idx - y, 2))
-    kde_array = kernel_vfunc(dist_array, window, weight)
-    array[miny:maxy, minx:maxx] += kde_array
+    while True:
+        remainder = length
+        for factor in (2, 3, 5):
+            while remainder % factor == 0:
+                remainder //= factor
+        if remainder == 1:
+            return length
+        length += 1
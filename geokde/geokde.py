@@ -1,9 +1,13 @@
 import geopandas as gpd
 import numpy as np
+import numpy.typing as npt
+import shapely
 
 from geokde._kernels import VALID_KERNELS
 from geokde._utils import (
+    VALID_METHODS,
     calculate_kde,
+    calculate_kde_fft,
     create_array,
     get_points,
     validate_transform,
@@ -17,7 +21,9 @@ def kde(
     kernel: str = "quartic",
     weight: int | float | str = 1.0,
     scale: bool = False,
-) -> tuple[np.ndarray, list[int | float]]:
+    dtype: npt.DTypeLike = np.float32,
+    method: str = "direct",
+) -> tuple[np.ndarray, list[float]]:
     """Estimate raw or scaled kernel density with a given radius (or radii), resolution,
     kernel, and weight(s) from point geometries in a given GeoDataFrame or GeoSeries.
 
@@ -42,21 +48,33 @@ def kde(
         int or float value.
     scale : bool, default = False
         Whether to calculate raw or scaled KDE values, defaults to False (raw).
+    dtype : numpy.typing.DTypeLike, default = numpy.float32
+        Data type of the output KDE array. Must be numpy.float32 or numpy.float64, the
+        latter for double precision at the cost of twice the memory. Default is
+        numpy.float32.
+    method : str, default = "direct"
+        Method with which to calculate KDE. Must be one of "direct" or "fft". "direct"
+        evaluates the kernel around each point's exact location. "fft" convolves
+        points, treated as lying at the centre of the cell containing them, with the
+        kernel; it requires a single radius for all points and is faster for many
+        points. Default is "direct".
 
     Returns
     -------
     array : numpy.ndarray
         Array of KDE values.
-    bounds : list[int | float]
+    bounds : list[float]
          The array's bounding coordinates in minx, miny, maxx, maxy format.
 
     Raises
     ------
     ValueError
-        If the specified kernel is invalid or resolution is greater than the maximum
-        specified radius.
+        If any geometries are empty, the specified kernel or method is invalid,
+        resolution is greater than the maximum specified radius, or method is "fft" and
+        radii differ.
     TypeError
-        If any geometries are not a point or scale is not boolean.
+        If any geometries are not a point, scale is not boolean, or dtype is not
+        float32 or float64.
 
     Examples
     --------
@@ -84,19 +102,33 @@ def kde(
     ) as dst:
         dst.write(kde_array, 1)
     """
-    if not all(points.geometry.geom_type == "Point"):
+    geometry = points.geometry.values
+    if (shapely.get_type_id(geometry) != shapely.GeometryType.POINT).any():
         raise TypeError("all geometries must be points.")
+    if shapely.is_empty(geometry).any():
+        raise ValueError("geometries must not be empty.")
     if kernel not in VALID_KERNELS:
         raise ValueError(f"kernel must be one of {VALID_KERNELS}, not: {kernel}")
     if not isinstance(scale, bool):
         raise TypeError(f"scale must be bool, not: {type(scale)}")
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise TypeError(f"dtype must be float32 or float64, not: {dtype}")
+    if method not in VALID_METHODS:
+        raise ValueError(f"method must be one of {VALID_METHODS}, not: {method}")
     radius_arr = validate_transform(radius, "radius", points)
     weight_arr = validate_transform(weight, "weight", points)
     if resolution > radius_arr.max():
         raise ValueError("resolution must be less than radius.")
+    if method == "fft" and (radius_arr != radius_arr[0]).any():
+        raise ValueError('radius must be a single value for method "fft".')
 
-    array, bounds = create_array(points.total_bounds, radius_arr.max(), resolution)
-    points = get_points(
+    array, bounds = create_array(
+        points.total_bounds,
+        radius_arr.max(),
+        resolution,
+        dtype,
+    )
+    x_idx, y_idx, window, weight_arr = get_points(
         points,
         bounds[0],
         bounds[3],
@@ -104,5 +136,8 @@ def kde(
         weight_arr,
         resolution,
     )
-    calculate_kde(points, array, kernel, scale)
+    if method == "fft":
+        calculate_kde_fft(x_idx, y_idx, window, weight_arr, array, kernel, scale)
+    else:
+        calculate_kde(x_idx, y_idx, window, weight_arr, array, kernel, scale)
     return array, bounds
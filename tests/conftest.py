@@ -11,6 +11,8 @@ def geodataframe() -> Callable:
         if geom_type == "points":
             points = [(0, 0), (10, 10)]
             geoms = [shapely.Point(*coords) for coords in points]
+        if geom_type == "empty_points":
+            geoms = [shapely.Point(), shapely.Point(10, 10)]
         if geom_type == "polygons":
             polygons = [(-180, 0, 0, 90), (0, 0, 90, 180)]
             geoms = [shapely.box(*coords) for coords in polygons]
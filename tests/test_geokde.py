@@ -1,3 +1,9 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
 import numpy as np
 import pytest
 
@@ -11,6 +17,8 @@ from geokde.geokde import kde
         ("points", 1, 0.1, "quartic", 1, False, None),
         # invalid geoms
         ("polygons", 1, 0.1, "quartic", 1, False, TypeError),
+        # empty geoms
+        ("empty_points", 1, 0.1, "quartic", 1, False, ValueError),
         # invalid kernel
         ("points", 1, 0.1, "invalid_kernel", 1, False, ValueError),
         # invalid scale
@@ -38,3 +46,70 @@ def test_kde(geodataframe, geom_type, radius, resolution, kernel, weight, scale,
         assert isinstance(array, np.ndarray)
         assert isinstance(bounds, list)
         # TODO: more detailed assertions
+
+
+@pytest.mark.parametrize(
+    ["dtype", "error"],
+    [
+        (np.float32, None),
+        (np.float64, None),
+        (np.int64, TypeError),
+    ],
+)
+def test_kde_dtype(geodataframe, dtype, error):
+    gdf = geodataframe("points")
+    if error:
+        with pytest.raises(error):
+            kde(gdf, 1, 0.1, dtype=dtype)
+    else:
+        array, _ = kde(gdf, 1, 0.1, dtype=dtype)
+        assert array.dtype == dtype
+
+
+@pytest.mark.parametrize(
+    ["method", "radius", "error"],
+    [
+        ("direct", "radius", None),
+        ("fft", "radius", None),
+        # differing radii
+        ("fft", "radius", ValueError),
+        ("invalid_method", 1, ValueError),
+    ],
+)
+def test_kde_method(geodataframe, method, radius, error):
+    gdf = geodataframe("points")
+    if error == ValueError and isinstance(radius, str):
+        gdf.at[0, "radius"] = 2
+    if error:
+        with pytest.raises(error):
+            kde(gdf, radius, 0.1, method=method)
+    else:
+        array, _ = kde(gdf, radius, 0.1, method=method)
+        assert array.any()
+
+
+def test_kde_concurrent_workqueue():
+    # numba's workqueue threading layer terminates the process if parallel functions
+    # are called concurrently, so such calls from kde must be serialised
+    script = textwrap.dedent(
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        import geopandas as gpd
+        import shapely
+
+        from geokde.geokde import kde
+
+        gdf = gpd.GeoDataFrame(geometry=[shapely.Point(0, 0), shapely.Point(10, 10)])
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda method: kde(gdf, 1, 0.01, method=method),
+                              ["direct", "fft"] * 4))
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parents[1],
+        env={**os.environ, "NUMBA_THREADING_LAYER": "workqueue"},
+        capture_output=True,
+    )
+    assert result.returncode == 0, result.stderr.decode()
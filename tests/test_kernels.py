@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from geokde import _kernels
@@ -25,3 +26,22 @@ def test_kernel(distance, radius, weight, expected):
     for kernel_vfunc in KERNEL_VFUNCS:
         result = kernel_vfunc(distance, radius, weight)
         assert result <= expected
+
+
+def test_kernel_array():
+    distance = np.array([0.0, 2.5, 5.0, 9.9, 10.0, 20.0])
+    for kernel_vfunc in KERNEL_VFUNCS:
+        result = kernel_vfunc(distance, 10.0, 1.0)
+        assert result.shape == distance.shape
+        assert np.all(np.diff(result) <= 0)
+        assert np.all(result[distance >= 10] == 0)
+        assert np.all(result[distance < 10] > 0)
+
+
+def test_evaluate_all():
+    distance = np.array([0.0, 2.5, 5.0, 9.9, 10.0, 20.0])
+    result = _kernels.evaluate_all(distance, 10.0, 2.0)
+    assert len(result) == len(KERNEL_VFUNCS)
+    for kernel_vfunc in KERNEL_VFUNCS:
+        expected = kernel_vfunc(distance, 10.0, 2.0)
+        assert np.allclose(result[kernel_vfunc.__name__], expected)
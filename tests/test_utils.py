@@ -1,6 +1,12 @@
 import numpy as np
+import pytest
 
+from geokde import _kernels
 from geokde._utils import (
+    ALIGNMENT,
+    TILE_SIZE,
+    calculate_kde,
+    calculate_kde_fft,
     create_array,
     validate_transform,
 )
@@ -10,9 +16,31 @@ def test_validate_transform(geodataframe):
     points = geodataframe("points")
     result = validate_transform("radius", "radius", points)
     assert isinstance(result, np.ndarray)
+    assert result.dtype == np.float64
     assert len(result) == len(points)
 
 
+@pytest.mark.parametrize(
+    ["dtype", "error"],
+    [
+        ("Int64", None),
+        ("float32", None),
+        ("complex128", TypeError),
+    ],
+)
+def test_validate_transform_dtype(geodataframe, dtype, error):
+    points = geodataframe("points")
+    points["radius"] = points["radius"].astype(dtype)
+    if error:
+        with pytest.raises(error):
+            validate_transform("radius", "radius", points)
+    else:
+        assert validate_transform("radius", "radius", points).dtype == np.float64
+        points.loc[0, "radius"] = None
+        with pytest.raises(ValueError):
+            validate_transform("radius", "radius", points)
+
+
 def test_create_array():
     radius = 10
     resolution = 1
@@ -20,7 +48,91 @@ def test_create_array():
     expected = [-20, -20, 20, 20]
     array, bounds = create_array(bounds, radius, resolution)
     assert array.shape == (40, 40)
+    assert array.ctypes.data % ALIGNMENT == 0
+    assert not array.any()
     assert bounds == expected
+    assert not any(isinstance(coord, np.generic) for coord in bounds)
+
+
+@pytest.mark.parametrize("kernel", _kernels.VALID_KERNELS)
+@pytest.mark.parametrize("scale", [False, True])
+@pytest.mark.parametrize(
+    ["x", "y"],
+    [
+        # window within array
+        (10.3, 9.6),
+        # window partially outside array
+        (1.2, 18.7),
+        # window entirely outside array
+        (-8.0, 30.0),
+    ],
+)
+def test_calculate_kde(kernel, scale, x, y):
+    window, weight = 4.5, 2.0
+    array = np.zeros((20, 20))
+    calculate_kde(
+        np.array([x]),
+        np.array([y]),
+        np.array([window]),
+        np.array([weight]),
+        array,
+        kernel,
+        scale,
+    )
+    y_idx, x_idx = np.ogrid[:20, :20]
+    distance = np.sqrt((x_idx + 0.5 - x) ** 2 + (y_idx + 0.5 - y) ** 2)
+    kernel_func = getattr(_kernels, f"{kernel}_{'scaled' if scale else 'raw'}")
+    expected = kernel_func(distance, window, weight)
+    assert np.allclose(array, expected)
+
+
+def test_calculate_kde_tiles():
+    # points whose windows straddle the edges and corner of adjoining tiles
+    size = 2 * TILE_SIZE
+    x_idx = np.array([TILE_SIZE - 0.3, TILE_SIZE + 2.6, 40.2])
+    y_idx = np.array([TILE_SIZE + 0.8, 100.1, TILE_SIZE - 3.7])
+    window = np.array([6.5, 9.0, 12.0])
+    weight = np.array([1.0, 2.0, 0.5])
+    array = np.zeros((size, size))
+    calculate_kde(x_idx, y_idx, window, weight, array, "quartic", False)
+    y_grid, x_grid = np.ogrid[:size, :size]
+    y_grid, x_grid = y_grid + 0.5, x_grid + 0.5
+    expected = sum(
+        _kernels.quartic_raw(np.sqrt((x_grid - x) ** 2 + (y_grid - y) ** 2), r, w)
+        for x, y, r, w in zip(x_idx, y_idx, window, weight)
+    )
+    assert np.allclose(array, expected)
+
+
+@pytest.mark.parametrize("kernel", _kernels.VALID_KERNELS)
+@pytest.mark.parametrize("scale", [False, True])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_calculate_kde_fft(kernel, scale, dtype):
+    # points at cell centres, for which the direct and FFT methods are equivalent
+    x_idx = np.array([10.5, 12.5, 3.5])
+    y_idx = np.array([9.5, 9.5, 17.5])
+    window = np.full(3, 4.5)
+    weight = np.array([2.0, 1.0, 0.5])
+    expected = np.zeros((20, 20))
+    calculate_kde(x_idx, y_idx, window, weight, expected, kernel, scale)
+    array = np.zeros((20, 20), dtype=dtype)
+    calculate_kde_fft(x_idx, y_idx, window, weight, array, kernel, scale)
+    assert np.allclose(array, expected, atol=np.finfo(dtype).resolution)
+
+
+def test_calculate_kde_fft_round_off():
+    # a cluster of points whose FFT round-off is negative at the edges of some windows
+    rng = np.random.default_rng(2)
+    x_idx, y_idx = rng.normal(150, 20, (2, 2000))
+    window = np.full(2000, 15.0)
+    weight = rng.uniform(0.1, 10, 2000)
+    array = np.zeros((300, 300))
+    calculate_kde_fft(x_idx, y_idx, window, weight, array, "epanechnikov", False)
+    assert (array >= 0).all()
+    # negative densities from negative weights are kept
+    array = np.zeros((300, 300))
+    calculate_kde_fft(x_idx, y_idx, window, -weight, array, "epanechnikov", False)
+    assert (array < 0).any()
 
 
-# TODO: final three _utils fn tests, though all covered by test_geokde
+# TODO: final two _utils fn tests, though all covered by test_geokde